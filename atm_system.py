@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import date, datetime
+from typing import Dict, Optional, Set
 
 
 # ---------------- Transaction ----------------
@@ -87,6 +87,86 @@ class Card:
         self.holder_name = holder_name
 
 
+# ---------------- CardRegistry ----------------
+CARD_ACTIVE = "active"
+CARD_BLOCKED = "blocked"
+CARD_CAPTURED = "captured"
+CARD_STATUSES = (CARD_ACTIVE, CARD_BLOCKED, CARD_CAPTURED)
+
+
+@dataclass(slots=True)
+class CardRecord:
+    card_number: str
+    account_number: str
+    expiry: Optional[date] = None
+    status: str = CARD_ACTIVE
+
+    def is_expired(self, today: Optional[date] = None) -> bool:
+        return self.expiry is not None and self.expiry < (today or date.today())
+
+
+class CardRegistry:
+    """
+    Maps many cards to one account:
+      - hot list (blocked / captured cards) is a set, checked in O(1)
+      - index is card_number -> CardRecord; an unknown number costs one dict probe
+      - account index is account_number -> card numbers on that account
+    """
+    def __init__(self):
+        self._index: Dict[str, CardRecord] = {}
+        self._by_account: Dict[str, list[str]] = {}
+        self._hot_list: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, card_number: str) -> bool:
+        return card_number in self._index
+
+    @staticmethod
+    def _check_status(status: str):
+        if status not in CARD_STATUSES:
+            raise ValueError(f"Invalid card status: {status!r}")
+
+    def register(self, card_number: str, account_number: str,
+                 expiry: Optional[date] = None, status: str = CARD_ACTIVE) -> CardRecord:
+        self._check_status(status)
+        if card_number in self._index:
+            raise ValueError("Card already registered.")
+        record = CardRecord(card_number, account_number, expiry, status)
+        self._index[card_number] = record
+        self._by_account.setdefault(account_number, []).append(card_number)
+        if status != CARD_ACTIVE:
+            self._hot_list.add(card_number)
+        return record
+
+    def get(self, card_number: str) -> Optional[CardRecord]:
+        return self._index.get(card_number)
+
+    def is_hot(self, card_number: str) -> bool:
+        return card_number in self._hot_list
+
+    def set_status(self, card_number: str, status: str):
+        self._check_status(status)
+        record = self._index.get(card_number)
+        if record is None:
+            raise ValueError("Unknown card.")
+        record.status = status
+        if status == CARD_ACTIVE:
+            self._hot_list.discard(card_number)
+        else:
+            self._hot_list.add(card_number)
+
+    def block(self, card_number: str):
+        self.set_status(card_number, CARD_BLOCKED)
+
+    def capture(self, card_number: str):
+        self.set_status(card_number, CARD_CAPTURED)
+
+    def cards_for_account(self, account_number: str) -> list[CardRecord]:
+        return [self._index[n] for n in self._by_account.get(account_number, ())]
+
+
 # ---------------- ATM ----------------
 class ATM:
     """
@@ -99,22 +179,48 @@ class ATM:
     def __init__(self, cash_on_hand: float = 2000.0):
         self.cash_on_hand = float(cash_on_hand)
         self.accounts: Dict[str, BankAccount] = {}  # account_number -> BankAccount
+        self.cards = CardRegistry()  # card_number -> CardRecord
         self._inserted_card: Optional[Card] = None
+        self._card_record: Optional[CardRecord] = None
         self._active_account: Optional[BankAccount] = None
         self._authed = False
         self._pin_attempts_left = 3
 
     def add_account(self, account: BankAccount):
+        # default card numbered after the account, so existing cards keep working
+        existing = self.cards.get(account.account_number)
+        if existing is not None and existing.account_number != account.account_number:
+            raise ValueError(
+                f"Card {account.account_number} is already issued on account {existing.account_number}."
+            )
         self.accounts[account.account_number] = account
+        if existing is None:
+            self.cards.register(account.account_number, account.account_number)
+
+    def issue_card(self, card_number: str, account_number: str,
+                   expiry: Optional[date] = None) -> CardRecord:
+        if account_number not in self.accounts:
+            raise ValueError("Unknown account.")
+        # a card numbered after another account would shadow that account's default card
+        if card_number != account_number and card_number in self.accounts:
+            raise ValueError(f"Card number {card_number} belongs to another account.")
+        return self.cards.register(card_number, account_number, expiry)
 
     # --- session lifecycle ---
     def insert_card(self, card: Card):
         if self._inserted_card:
             raise ValueError("A card is already inserted.")
+        # Hot list first: blocked / captured cards never reach an account lookup
+        if self.cards.is_hot(card.card_number):
+            raise ValueError(f"Card is {self.cards.get(card.card_number).status}.")
         # Validate card number exists in our registry
-        if card.card_number not in self.accounts:
+        record = self.cards.get(card.card_number)
+        if record is None or record.account_number not in self.accounts:
             raise ValueError("Unknown card/account.")
+        if record.is_expired():
+            raise ValueError("Card has expired.")
         self._inserted_card = card
+        self._card_record = record
         self._active_account = None
         self._authed = False
         self._pin_attempts_left = 3
@@ -123,7 +229,7 @@ class ATM:
         if not self._inserted_card:
             raise ValueError("Insert a card first.")
 
-        acct = self.accounts[self._inserted_card.card_number]
+        acct = self.accounts[self._card_record.account_number]
         if pin == acct.pin:
             self._active_account = acct
             self._authed = True
@@ -146,13 +252,16 @@ class ATM:
         if not self._inserted_card:
             raise ValueError("No card to eject.")
         self._inserted_card = None
+        self._card_record = None
         self._active_account = None
         self._authed = False
         self._pin_attempts_left = 3
 
     def _capture_card(self):
-        # For simplicity, just clear state (card kept by ATM in real life)
+        # Card is kept by the ATM: hot-list it so it is rejected if re-presented
+        self.cards.capture(self._card_record.card_number)
         self._inserted_card = None
+        self._card_record = None
         self._active_account = None
         self._authed = False
         self._pin_attempts_left = 3
@@ -2,7 +2,9 @@
 Test suite for ATM System
 """
 import pytest
-from atm_system import BankAccount, Card, ATM, Transaction
+from datetime import date
+
+from atm_system import BankAccount, Card, ATM, Transaction, CardRegistry
 
 
 class TestBankAccount:
@@ -23,4 +25,117 @@ class TestBankAccount:
         assert account.balance == 1500.0
         assert len(account.history) == 1
         assert account.history[0].amount == deposit_amount
-        assert account.history[0].transaction_type == "Deposit"
\ No newline at end of file
+        assert account.history[0].transaction_type == "Deposit"
+
+
+class TestCardRegistry:
+    """Test cases for card lookup in ATM.insert_card"""
+
+    def _atm(self):
+        atm = ATM(cash_on_hand=1000.0)
+        atm.add_account(BankAccount(account_number="123456", pin="1234", balance=100.0, owner="Test User"))
+        return atm
+
+    def test_multiple_cards_reach_same_account(self):
+        """Test that an extra card issued on an account authenticates against that account"""
+        # Arrange
+        atm = self._atm()
+        atm.issue_card("4000000000000001", "123456")
+
+        # Act
+        atm.insert_card(Card(card_number="4000000000000001", pin="1234"))
+        ok = atm.enter_pin("1234")
+
+        # Assert
+        assert ok
+        assert atm.check_balance() == 100.0
+        assert [r.card_number for r in atm.cards.cards_for_account("123456")] == ["123456", "4000000000000001"]
+
+    def test_unknown_card_is_rejected_before_account_lookup(self):
+        """Test that unregistered card numbers are rejected without touching accounts"""
+        # Arrange
+        class CountingDict(dict):
+            lookups = 0
+
+            def __contains__(self, key):
+                CountingDict.lookups += 1
+                return super().__contains__(key)
+
+        atm = self._atm()
+        atm.accounts = CountingDict(atm.accounts)
+
+        # Act
+        with pytest.raises(ValueError, match="Unknown card"):
+            atm.insert_card(Card(card_number="5999999999999999", pin="0000"))
+
+        # Assert
+        assert "5999999999999999" not in atm.cards
+        assert CountingDict.lookups == 0
+
+    def test_issued_card_cannot_shadow_account_number(self):
+        """Test that a card number colliding with an account number is refused"""
+        # Arrange
+        atm = self._atm()
+        atm.add_account(BankAccount(account_number="654321", pin="4321", balance=50.0))
+        atm.issue_card("777777", "123456")
+
+        # Assert: issued card using an existing account's number
+        with pytest.raises(ValueError, match="belongs to another account"):
+            atm.issue_card("654321", "123456")
+        # Assert: account added later whose number is already an issued card
+        with pytest.raises(ValueError, match="already issued on account 123456"):
+            atm.add_account(BankAccount(account_number="777777", pin="0000"))
+        assert "777777" not in atm.accounts
+        assert atm.cards.get("777777").account_number == "123456"
+
+    def test_invalid_status_is_rejected(self):
+        """Test that card statuses are limited to the known values"""
+        # Arrange
+        registry = CardRegistry()
+        registry.register("4000000000000001", "123456")
+
+        # Assert
+        with pytest.raises(ValueError, match="Invalid card status"):
+            registry.set_status("4000000000000001", "activ")
+        with pytest.raises(ValueError, match="Invalid card status"):
+            registry.register("4000000000000002", "123456", status="lost")
+        assert not registry.is_hot("4000000000000001")
+        assert "4000000000000002" not in registry
+
+    def test_blocked_card_is_rejected(self):
+        """Test that a blocked card is refused with its status"""
+        # Arrange
+        atm = self._atm()
+        atm.cards.block("123456")
+
+        # Assert
+        with pytest.raises(ValueError, match="Card is blocked"):
+            atm.insert_card(Card(card_number="123456", pin="1234"))
+
+    def test_captured_card_is_hot_listed(self):
+        """Test that a card captured after wrong PINs is rejected on re-insert"""
+        # Arrange
+        atm = self._atm()
+        card = Card(card_number="123456", pin="1234")
+        atm.insert_card(card)
+
+        # Act
+        atm.enter_pin("0000")
+        atm.enter_pin("0000")
+        with pytest.raises(ValueError, match="Card captured"):
+            atm.enter_pin("0000")
+
+        # Assert
+        assert atm.cards.is_hot("123456")
+        with pytest.raises(ValueError, match="Card is captured"):
+            atm.insert_card(card)
+
+    def test_expired_card_is_rejected(self):
+        """Test that an expired card cannot be inserted"""
+        # Arrange
+        atm = self._atm()
+        atm.issue_card("4000000000000002", "123456", expiry=date(2000, 1, 31))
+
+        # Assert
+        with pytest.raises(ValueError, match="expired"):
+            atm.insert_card(Card(card_number="4000000000000002", pin="1234"))